@@ -52,12 +52,9 @@ class DifferentialCoords(ShapeSpace):
         self.SO = SO3(self.ref.f.shape[0])
         self.SPD = SPD(self.ref.f.shape[0])
 
-        # tensor mapping versor to skew-sym. matrix
-        I = np.eye(3)
-        O = np.zeros(3)
-        self.versor2skew = np.array([[O, -I[2], I[1]], [I[2], O, -I[0]], [-I[1], I[0], O]])
-        # ... and the opposite direction
-        self.skew2versor = .5 * self.versor2skew
+        # tensors mapping versor to skew-sym. matrix and vice versa (shared with SO3)
+        self.versor2skew = self.SO.versor2skew
+        self.skew2versor = self.SO.skew2versor
 
     def __str__(self):
         return 'Differential Coordinates Shape Space'
@@ -55,6 +55,15 @@ class FundamentalCoords(ShapeSpace):
 
         self.spanning_tree_path = self.setup_spanning_tree_path()
 
+        # inner edges as upper/lower triangle of face adjacency (depend on topology only, so set up once)
+        self.edges_triu = sparse.triu(self.ref.inner_edges).tocoo()
+        self.edges_tril = sparse.tril(self.ref.inner_edges).tocoo()
+        # ...and as (face, neighbor) -> 1 + edge id lookup (0 marks non-adjacent faces)
+        self.edges_triu_lookup = sparse.csr_matrix((self.edges_triu.data + 1, (self.edges_triu.row, self.edges_triu.col)),
+                                                   shape=self.edges_triu.shape)
+        self.edges_tril_lookup = sparse.csr_matrix((self.edges_tril.data + 1, (self.edges_tril.row, self.edges_tril.col)),
+                                                   shape=self.edges_tril.shape)
+
         # rotation and stretch manifolds
         self.SO = SO3(int(0.5 * self.ref.inner_edges.getnnz()))        # relative rotations (transition rotations)
         self.SPD = SPD(self.ref.f.shape[0], 2)                         # stretch w.r.t. tangent space
@@ -132,7 +141,7 @@ class FundamentalCoords(ShapeSpace):
         frame = np.einsum('...ji,...jk', R, self.ref_frame_field)
 
         # setup ...transition rotations for every inner edge
-        e = sparse.triu(self.ref.inner_edges).tocoo()
+        e = self.edges_triu
         C = np.zeros((e.getnnz(), 3, 3))
         C[e.data[:]] = np.einsum('...ji,...jk', frame[e.row[:]], frame[e.col[:]])
 
@@ -161,7 +170,7 @@ class FundamentalCoords(ShapeSpace):
         CC = np.zeros_like(CoI)
         BB = (fsourceId < ftargetId)
         CC[BB] = CoI[BB]
-        CC[~BB] = np.einsum("...ij->...ji", CoI[~BB])
+        CC[~BB] = np.swapaxes(CoI[~BB], -1, -2)
 
         R= np.repeat(np.eye(3)[np.newaxis, :, :], len(self.ref.f), axis=0)
 
@@ -178,14 +187,12 @@ class FundamentalCoords(ShapeSpace):
 
         idx_1, idx_2, idx_3, n_1, n_2, n_3 = self.ref.neighbors
 
-        e = sparse.triu(self.ref.inner_edges).tocoo(); f = sparse.tril(self.ref.inner_edges).tocoo()
-
-        e.data += 1; f.data += 1
+        e = self.edges_triu; f = self.edges_tril
 
         CC = np.zeros((C.shape[0] + 1, 3, 3)); CCt = np.zeros((C.shape[0] + 1, 3, 3))
-        CC[e.data] = C[e.data - 1]; CCt[f.data] = np.einsum("...ij->...ji", C[f.data - 1])
+        CC[e.data + 1] = C[e.data]; CCt[f.data + 1] = np.swapaxes(C[f.data], -1, -2)
 
-        e = e.tocsr(); f = f.tocsr()
+        e = self.edges_triu_lookup; f = self.edges_tril_lookup
 
         Dijk = R.copy()
         n_iter = 0
@@ -211,14 +218,27 @@ class FundamentalCoords(ShapeSpace):
             if (n_iter + 1 == self.integration_iter) or (errCoord < errCoordTol):
                 break
 
+            # loop-invariant factors U_j * frame_j * C_ij * frame_i^T for face i and its neighbor j
+            # (set up on first local step only, so they cost nothing if the global step converges right away)
+            if n_iter == 0:
+                frame = self.ref_frame_field
+                j_1 = n_1[:, 0]
+                UFCF_1 = np.einsum('...jk,...kl,...lm,...nm', U[j_1], frame[j_1], CCt[e[idx_1, j_1]] + CC[f[idx_1, j_1]], frame[idx_1])
+                if n_2.shape[0] > 0 :
+                    j_2 = n_2[:, 1]
+                    UFCF_2 = np.einsum('...jk,...kl,...lm,...nm', U[j_2], frame[j_2], CCt[e[idx_2, j_2]] + CC[f[idx_2, j_2]], frame[idx_2])
+                if n_3.shape[0] > 0 :
+                    j_3 = n_3[:, 2]
+                    UFCF_3 = np.einsum('...jk,...kl,...lm,...nm', U[j_3], frame[j_3], CC[f[idx_3, j_3]] + CCt[e[idx_3, j_3]], frame[idx_3])
+
             # compute gradients again
             D = (self.ref.grad @ v).reshape(-1, 3, 3)
 
-            Dijk[idx_1] = np.einsum('...ji,...jk,...kl,...lm,...nm', D[n_1[:, 0]], U[n_1[:, 0]], self.ref_frame_field[n_1[:, 0]], CCt[e[idx_1, n_1[:, 0]]] + CC[f[idx_1, n_1[:, 0]]], self.ref_frame_field[idx_1])
+            Dijk[idx_1] = np.einsum('...ji,...jk', D[j_1], UFCF_1)
             if n_2.shape[0] > 0 :
-                Dijk[idx_2] = Dijk[idx_2] + np.einsum('...ji,...jk,...kl,...lm,...nm', D[n_2[:, 1]], U[n_2[:, 1]], self.ref_frame_field[n_2[:, 1]], CCt[e[idx_2, n_2[:, 1]]] + CC[f[idx_2, n_2[:, 1]]], self.ref_frame_field[idx_2])
+                Dijk[idx_2] = Dijk[idx_2] + np.einsum('...ji,...jk', D[j_2], UFCF_2)
             if n_3.shape[0] > 0 :
-                Dijk[idx_3] = Dijk[idx_3] + np.einsum('...ji,...jk,...kl,...lm,...nm', D[n_3[:, 2]], U[n_3[:, 2]], self.ref_frame_field[n_3[:, 2]], CC[f[idx_3, n_3[:, 2]]] + CCt[e[idx_3, n_3[:, 2]]], self.ref_frame_field[idx_3])
+                Dijk[idx_3] = Dijk[idx_3] + np.einsum('...ji,...jk', D[j_3], UFCF_3)
 
             Uijk, Sijk, Vtijk = np.linalg.svd(Dijk)
             R = np.einsum('...ij,...jk', Uijk, Vtijk)
@@ -17,9 +17,19 @@ from scipy.linalg import logm, expm
 import numpy.linalg as la
 
 from pymanopt.manifolds.manifold import Manifold
-from pymanopt.manifolds.rotations import randskew, randrot
+from pymanopt.manifolds.rotations import randrot
 from pymanopt.tools.multi import multiskew
 
+# tensor mapping versor to skew-sym. matrix
+_VERSOR2SKEW = np.array([[[0, 0, 0], [0, 0, -1], [0, 1, 0]],
+                         [[0, 0, 1], [0, 0, 0], [-1, 0, 0]],
+                         [[0, -1, 0], [1, 0, 0], [0, 0, 0]]], dtype=float)
+# ... and the opposite direction
+_SKEW2VERSOR = .5 * _VERSOR2SKEW
+# (shared by all instances)
+_VERSOR2SKEW.flags.writeable = False
+_SKEW2VERSOR.flags.writeable = False
+
 class SO3(Manifold):
     """Returns the product manifold SO(3)^k, i.e., a product of k rotations in 3 dimensional space.
 
@@ -32,6 +42,9 @@ class SO3(Manifold):
      Riemannian submanifold of (R^3x3)^k endowed with the usual trace inner product.
 
      NOTE: Tangent vectors are represented in the Lie algebra, i.e., as skew symmetric matrices.
+
+     NOTE: exp, log, geopoint, transp, and elemdist also accept stacks of N elements, i.e., arrays of size Nxkx3x3, and
+     process them in one go.
      """
 
     def __init__(self, k=1):
@@ -44,12 +57,15 @@ class SO3(Manifold):
 
         self._k = k
 
-        # tensor mapping versor to skew-sym. matrix
-        I = np.eye(3)
-        O = np.zeros(3)
-        self.versor2skew = np.array([[O, -I[2], I[1]], [I[2], O, -I[0]], [-I[1], I[0], O]])
-        # ... and the opposite direction
-        self.skew2versor = .5 * self.versor2skew
+        # (module-level constants shared by all instances)
+        self.versor2skew = _VERSOR2SKEW
+        self.skew2versor = _SKEW2VERSOR
+
+        # basis of the Lie algebra (one copy per rotation) used by jacONB; change sign for convenience
+        # (read-only views, no copies)
+        self._jac_basis = (np.broadcast_to(-self.versor2skew[2], (k, 3, 3)),
+                           np.broadcast_to(self.versor2skew[1], (k, 3, 3)),
+                           np.broadcast_to(-self.versor2skew[0], (k, 3, 3)))
 
     def __str__(self):
         return self._name
@@ -86,13 +102,13 @@ class SO3(Manifold):
         """orthogonal (with respect to the euclidean inner product) projection of ambient
         vector ((k,3,3) array) onto the tangentspace at X"""
         # skew-sym. part of: H * X.T
-        return multiskew(np.einsum('...ij,...kj', X, H))
+        return multiskew(X @ np.swapaxes(H, -1, -2))
 
     egrad2rgrad = proj
 
     def lefttrans(self, R, X):
         """Left-translation of X to the tangent space at R"""
-        return np.einsum('...ij,...jk', R, X)
+        return R @ X
 
     def ehess2rhess(self, R, H):
         # TODO
@@ -106,33 +122,38 @@ class SO3(Manifold):
         """Riemannian exponential with base point R evaluated at X"""
         assert R.shape == X.shape
 
-        a = R.ndim - 2
-        versors = Rotation.from_rotvec(np.tensordot(X, self.skew2versor, axes=([a, a+1], [a, a+1])))
-        return np.einsum('...ij,...jk', versors.as_matrix(), R)
+        return rotvec2mat(skew2vec(X)) @ R
 
     def log(self, R, Q):
         """Riemannian logarithm with base point R evaluated at Q"""
         assert R.shape == Q.shape
 
-        versors = Rotation.from_matrix(np.einsum('...ij,...kj', Q, R)).as_rotvec()
-        return np.einsum('ijk,...k', self.versor2skew, versors)
+        return vec2skew(mat2rotvec(Q @ np.swapaxes(R, -1, -2)))
 
     def geopoint(self, R, Q, t):
         """Evaluate the geodesic from R to Q at time t in [0, 1]"""
         assert R.shape == Q.shape and np.isscalar(t)
 
-        return self.exp(R, t * self.log(R, Q))
+        # endpoints need neither log nor exp
+        if t == 0:
+            return R.copy()
+        elif t == 1:
+            return Q.copy()
+
+        # exp(R, t * log(R, Q)) without the round trip through skew-symmetric matrices
+        versors = mat2rotvec(Q @ np.swapaxes(R, -1, -2))
+        return rotvec2mat(t * versors) @ R
 
     def rand(self):
         return randrot(3, self._k)
 
     def randvec(self, X):
-        U = randskew(3, self._k)
-        nrmU = np.sqrt(np.tensordot(U, U, axes=U.ndim))
-        return U / nrmU
+        # (same shape as X, i.e., 3x3 for k=1 as returned by rand)
+        U = vec2skew(np.random.randn(self._k, 3).astype(X.dtype)).reshape(X.shape)
+        return U / la.norm(U)
 
     def zerovec(self, X):
-        return np.zeros((self._k, 3, 3))
+        return np.zeros((self._k, 3, 3), dtype=X.dtype)
 
     def transp(self, R, Q, X):
         """Parallel transport for SO(3)^k.
@@ -143,26 +164,28 @@ class SO3(Manifold):
         """
         assert R.shape == Q.shape == X.shape
 
-        # o <- log(R,Q)/2
-        o = .5 * Rotation.from_matrix(np.einsum('...ij,...kj', Q, R)).as_rotvec()
-        O = Rotation.from_rotvec(o).as_matrix()
-        return np.einsum('...ji,...jk,...kl', O, X, O)
+        # O <- exp(log(R,Q)/2), i.e., square root (q + 1) / |q + 1| of unit quaternion q with non-negative real part
+        q = Rotation.from_matrix((Q @ np.swapaxes(R, -1, -2)).reshape(-1, 3, 3)).as_quat()
+        q *= np.where(q[:, 3:] < 0, -1, 1)
+        q[:, 3] += 1
+        O = Rotation.from_quat(q).as_matrix().reshape(R.shape).astype(R.dtype, copy=False)
+        return np.swapaxes(O, -1, -2) @ X @ O
 
     def pairmean(self, R, Q):
         assert R.shape == Q.shape
 
-        return self.exp(R, 0.5 * self.log(R, Q))
+        return self.geopoint(R, Q, .5)
 
     def elemdist(self, R, Q):
         """element-wise distance function"""
         assert R.shape == Q.shape
 
-        versors = Rotation.from_matrix(np.einsum('...ij,...kj', Q, R)).as_rotvec()
-        return np.sqrt(2)*la.norm(versors, axis=1)
+        versors = mat2rotvec(Q @ np.swapaxes(R, -1, -2))
+        return np.sqrt(2 * np.sum(versors**2, axis=-1))
 
     def dist(self, R, Q):
         """product distance function"""
-        versors = Rotation.from_matrix(np.einsum('...ij,...kj', Q, R)).as_rotvec()
+        versors = mat2rotvec(Q @ np.swapaxes(R, -1, -2))
         return np.sqrt(2 * np.sum(versors**2))
 
     def projToGeodesic(self, R, Q, P, max_iter = 10):
@@ -206,33 +229,39 @@ class SO3(Manifold):
         """
         assert R.shape == Q.shape
 
-        V = self.log(R, Q)
+        # (k x 3 x 3 also for k=1, so that all fields and norms below share the leading axis)
+        V = self.log(R, Q).reshape(self._k, 3, 3)
 
-        # (number of faces) x (number of basis elements) x 3 x 3
-        F = np.zeros((self._k, 3, 3, 3))
-        lam = np.zeros((self._k, 3))
+        lam = np.zeros((self._k, 3), dtype=V.dtype)
 
         x = np.atleast_2d(V[..., 0, 1]).T
         y = np.atleast_2d(V[..., 0, 2]).T
         z = np.atleast_2d(V[..., 1, 2]).T
 
+        # squared rotation angles
+        xz2 = x**2 + z**2
+        theta2 = xz2 + y**2
+
         # eigenvalues
-        lam[:, 1:] = 1 / 4 * np.tile(x**2 + y**2 + z**2, (1, 2))
+        lam[:, 1:] = 1 / 4 * theta2
 
-        # change sign for convenience
-        e1 = np.tile(-self.versor2skew[2], (self._k, 1, 1))
-        e2 = np.tile(self.versor2skew[1], (self._k, 1, 1))
-        e3 = np.tile(-self.versor2skew[0], (self._k, 1, 1))
+        e1, e2, e3 = self._jac_basis
 
         # normalized eigenbasis unless x = 0 and z = 0
-        F[:, 0, ...] = vectime3d(1 / self.elemnorm(R, V), V)
-        F[:, 1, ...] = vectime3d(-z, e1) + vectime3d(x, e3)
-        F[:, 2, ...] = vectime3d(-x * y, e1) + vectime3d(x**2 + z**2, e2) + vectime3d(- y * z, e3)
+        F0 = V
+        F1 = vectime3d(-z, e1) + vectime3d(x, e3)
+        F2 = vectime3d(-x * y, e1) + vectime3d(xz2, e2) + vectime3d(- y * z, e3)
+
+        # guard denominators against 0 (these fields are replaced below anyway)
+        n0 = np.sqrt(2 * theta2)
+        n1 = self.elemnorm(R, F1)
+        n2 = self.elemnorm(R, F2)
+        F0 = vectime3d(1 / np.where(n0 == 0, 1, n0), F0)
+        F1 = vectime3d(1 / np.where(n1 == 0, 1, n1), F1)
+        F2 = vectime3d(1 / np.where(n2 == 0, 1, n2), F2)
 
-        # take care of division by 0 later
-        with np.errstate(all='ignore'):
-            F[:, 1, ...] = vectime3d(1 / self.elemnorm(R, F[:, 1, ...]), F[:, 1, ...])
-            F[:, 2, ...] = vectime3d(1 / self.elemnorm(R, F[:, 2, ...]), F[:, 2, ...])
+        # (number of faces) x (number of basis elements) x 3 x 3
+        F = np.stack((F0, F1, F2), axis=1).astype(V.dtype, copy=False)
 
         # take care of special cases
         ind = np.nonzero(np.abs(x + z) < 1e-12)
@@ -257,8 +286,7 @@ class SO3(Manifold):
         assert R.shape == Q.shape == X.shape
 
         V = self.log(R, Q)
-        return 1 / 4 * (-np.einsum('...ij,...jk,...kl', V, V, X) + 2 * np.einsum('...ij,...jk,...kl', V, X, V)
-                        - np.einsum('...ij,...jk,...kl', X, V, V))
+        return 1 / 4 * (-V @ V @ X + 2 * V @ X @ V - X @ V @ V)
 
     def adjJacobi(self, R, Q, t, X):
         """Evaluates an adjoint Jacobi field along the geodesic gam from R to Q.
@@ -322,9 +350,36 @@ def weightfun(k, t, d):
     :returns weight(s)
     """
     # eigenvalues are non-negative
-    w = np.sin((1 - t) * np.multiply(np.sqrt(k).T, d).T) / np.where(k == 0, 1, np.sin(np.multiply(np.sqrt(k).T, d).T))
-
-    return np.where(w == 0, 1 - t, w)
+    theta = np.multiply(np.sqrt(k).T, d).T
+    # (limit 1 - t for vanishing eigenvalues)
+    zero = k == 0
+    return np.where(zero, 1 - t, np.sin((1 - t) * theta) / np.where(zero, 1, np.sin(theta)))
+
+def vec2skew(v):
+    """Skew-symmetric matrices of (stacked) versors, i.e., v is of size ...x3 and the result of size ...x3x3"""
+    X = np.zeros(v.shape + (3,), dtype=v.dtype)
+    X[..., 2, 1] = v[..., 0]
+    X[..., 1, 2] = -v[..., 0]
+    X[..., 0, 2] = v[..., 1]
+    X[..., 2, 0] = -v[..., 1]
+    X[..., 1, 0] = v[..., 2]
+    X[..., 0, 1] = -v[..., 2]
+    return X
+
+def skew2vec(X):
+    """Versors of (stacked) skew-symmetric matrices, i.e., X is of size ...x3x3 and the result of size ...x3"""
+    # (contraction with the constant tensor is a single BLAS call, faster than gathering the entries)
+    return np.tensordot(X, _SKEW2VERSOR.astype(X.dtype, copy=False), axes=([X.ndim - 2, X.ndim - 1], [0, 1]))
+
+def mat2rotvec(R):
+    """Rotation vectors of (stacked) rotation matrices, i.e., R is of size ...x3x3 and the result of size ...x3"""
+    # (scipy computes in double precision; cast back to input dtype)
+    return Rotation.from_matrix(R.reshape(-1, 3, 3)).as_rotvec().reshape(R.shape[:-1]).astype(R.dtype, copy=False)
+
+def rotvec2mat(v):
+    """Rotation matrices of (stacked) rotation vectors, i.e., v is of size ...x3 and the result of size ...x3x3"""
+    # (scipy computes in double precision; cast back to input dtype)
+    return Rotation.from_rotvec(v.reshape(-1, 3)).as_matrix().reshape(v.shape + (3,)).astype(v.dtype, copy=False)
 
 def exp_mat(U):
     """Matrix exponential, only use for normal matrices, i.e., square matrices U with U * U^T = U^T * UU"""
@@ -356,7 +411,4 @@ def vectime3d(x, A):
     assert x.shape[0] == 1 or x.shape[1] == 1
     assert x.shape[0] == A.shape[0] or x.shape[1] == A.shape[0]
 
-    if x.shape[1] == 1:
-        x = x.T
-    A = np.einsum('kij->ijk', A)
-    return np.einsum('ijk->kij', x * A)
+    return x.reshape(-1, 1, 1) * A
@@ -14,8 +14,6 @@ import numpy as np
 import numpy.random as rnd
 import numpy.linalg as la
 
-from scipy.linalg import logm, expm_frechet
-
 from pymanopt.manifolds.manifold import Manifold
 from pymanopt.tools.multi import multisym
 
@@ -107,7 +105,7 @@ class SPD(Manifold):
 
     def rand(self):
         S = np.random.random((self._k, self._d, self._d))
-        return np.einsum('...ij,...kj', S, S)
+        return S @ np.swapaxes(S, -1, -2)
 
     def randvec(self, X):
         Y = self.rand()
@@ -115,7 +113,7 @@ class SPD(Manifold):
         return y / self.norm(X, y)
 
     def zerovec(self, X):
-        return np.zeros((self._k, self._d, self._d))
+        return np.zeros((self._k, self._d, self._d), dtype=X.dtype)
 
     def transp(self, S, T, X):
         """Parallel transport for Sym+(d)^k.
@@ -205,17 +203,41 @@ def log_mat(U):
 def dexp(X, G):
     """Evaluate the derivative of the matrix exponential at
     X in direction G.
+    NOTE: X must be symmetric (see dfun).
     """
-    return np.array([expm_frechet(X[i],G[i])[1] for i in range(X.shape[0])])
+    return dfun(X, G, np.exp, np.exp)
 
 def dlog(X, G):
     """Evaluate the derivative of the matrix logarithm at
     X in direction G.
+    NOTE: X must be symmetric positive definite (see dfun).
+    """
+    return dfun(X, G, np.log, lambda x: 1 / x)
+
+def dfun(X, G, f, df):
+    """Evaluate the derivative of the matrix function induced by f at symmetric X in direction G via the
+    Daleckii-Krein formula, i.e., V * (L o (V^T * G * V)) * V^T with eigendecomposition X = V * diag(l) * V^T and
+    first divided differences L_ij = (f(l_i) - f(l_j)) / (l_i - l_j) (or df(l_i) for l_i = l_j).
+    All k matrices are processed at once. Only valid for symmetric X (f must be defined on the eigenvalues of X).
+    :param X: array of size k x d x d of symmetric matrices
+    :param G: array of size k x d x d
+    :param f: scalar function (vectorized)
+    :param df: derivative of f (vectorized)
+    :return: k x d x d array of derivatives
     """
-    n = X.shape[1]
-    # set up [[X, G], [0, X]]
-    W = np.hstack((np.dstack((X, G)), np.dstack((np.zeros_like(X), X))))
-    return np.array([logm(W[i])[:n, n:] for i in range(X.shape[0])])
+    assert np.allclose(X, np.swapaxes(X, -1, -2)), 'X must be symmetric'
+
+    vals, vecs = la.eigh(X)
+
+    # first divided differences (derivative at midpoint for (nearly) coinciding eigenvalues)
+    li = vals[..., :, np.newaxis]
+    lj = vals[..., np.newaxis, :]
+    diff = li - lj
+    close = np.abs(diff) < np.sqrt(np.finfo(vals.dtype).eps) * np.maximum(1, np.maximum(np.abs(li), np.abs(lj)))
+    L = np.where(close, df(.5 * (li + lj)), (f(li) - f(lj)) / np.where(close, 1, diff))
+
+    Vt = np.swapaxes(vecs, -1, -2)
+    return vecs @ (L * (Vt @ G @ vecs)) @ Vt
 
 
 def vectime3d(x, A):
@@ -224,14 +246,11 @@ def vectime3d(x, A):
     :param A: array of size k x n x m
     :return: k x n x m array such that the j-th n x m slice of A is multiplied with the j-th element of x
     """
-    assert np.size(x.shape[0]) == 2 and np.size(A) == 3
+    assert x.ndim == 2 and A.ndim == 3
     assert x.shape[0] == 1 or x.shape[1] == 1
     assert x.shape[0] == A.shape[0] or x.shape[1] == A.shape[0]
 
-    if x.shape[0] == 1:
-        x = x.T
-    A = np.einsum('kij->ijk', A)
-    return np.einsum('ijk->kij', x * A)
+    return x.reshape(-1, 1, 1) * A
 
 def vectime3dB(x, A):
     """
@@ -249,7 +268,4 @@ def vectime3dB(x, A):
     assert x.shape[0] == 1 or x.shape[1] == 1
     assert x.shape[0] == A.shape[0] or x.shape[1] == A.shape[0]
 
-    if x.shape[1] == 1:
-        x = x.T
-    A = np.einsum('kij->ijk', A)
-    return np.einsum('ijk->kij', x * A)
+    return x.reshape(-1, 1, 1) * A